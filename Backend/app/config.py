@@ -3,6 +3,8 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "postgresql+asyncpg://valentine:valentine@db:5432/valentine"
+    database_read_url: str = ""
+    read_your_writes_seconds: float = 5.0
     s3_endpoint_url: str = "https://s3.amazonaws.com"
     s3_bucket: str = "valentine-saturn"
     s3_access_key: str = ""
@@ -11,6 +13,8 @@ class Settings(BaseSettings):
     owner_phone: str = "+79001234567"
     cors_origins: list[str] = ["http://localhost:3000"]
     session_duration_hours: int = 4
+    duplicate_submit_window_seconds: float = 2.0
+    compact_attempts: bool = False
     admin_password: str = "saturn-admin"
 
     model_config = {"env_file": ".env", "extra": "ignore"}
@@ -1,13 +1,86 @@
+import time
 from collections.abc import AsyncGenerator
+from uuid import UUID
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.config import settings
+from app.repository import Repository, repository_class
 
-engine = create_async_engine(settings.database_url, echo=False, pool_pre_ping=True)
+_repository = repository_class(settings.database_url)
+engine = _repository.create_engine(settings.database_url)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Read-only sessions on the primary; a separate engine only where the backend needs one (file-backed SQLite).
+if _repository.needs_read_engine(settings.database_url):
+    primary_read_engine = _repository.create_engine(settings.database_url, for_writes=False)
+    primary_read_session = async_sessionmaker(primary_read_engine, class_=AsyncSession, expire_on_commit=False)
+else:
+    primary_read_engine = engine
+    primary_read_session = async_session
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+# Optional replica for admin and status reads; falls back to the primary when unset.
+if settings.database_read_url:
+    _read_repository = repository_class(settings.database_read_url)
+    read_engine = _read_repository.create_engine(settings.database_read_url, for_writes=False)
+    read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+else:
+    _read_repository = _repository
+    read_engine = engine
+    read_session = primary_read_session
+
+# session_id -> monotonic deadline until which its reads stay on the primary.
+# Per-process: each worker only pins sessions it wrote itself.
+_recent_writes: dict[UUID, float] = {}
+
+
+def mark_session_written(session_id: UUID) -> None:
+    """Pin reads for this session to the primary until the replica has caught up."""
+    if read_engine is engine:
+        return
+    now = time.monotonic()
+    _recent_writes[session_id] = now + settings.read_your_writes_seconds
+    # Drop expired pins so the map stays bounded by recent write traffic
+    if len(_recent_writes) > 1024:
+        for sid in [sid for sid, deadline in _recent_writes.items() if deadline < now]:
+            del _recent_writes[sid]
+
+
+def _read_from_primary(session_id: UUID | None) -> bool:
+    if read_engine is engine:
+        return True
+    if session_id is None:
+        return False
+    deadline = _recent_writes.get(session_id)
+    if deadline is None:
+        return False
+    if deadline < time.monotonic():
+        del _recent_writes[session_id]
+        return False
+    return True
+
+
+async def get_db() -> AsyncGenerator[Repository, None]:
     async with async_session() as session:
-        yield session
+        yield _repository(session)
+
+
+def _request_session_id(request: Request) -> UUID | None:
+    # Read straight from the request so the dependency adds no parameter of its own;
+    # the endpoint still declares and validates session_id itself.
+    raw = request.path_params.get("session_id") or request.query_params.get("session_id")
+    try:
+        return UUID(raw) if raw else None
+    except ValueError:
+        return None
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[Repository, None]:
+    """Read-only repository: the replica, or the primary if this session was just written."""
+    if _read_from_primary(_request_session_id(request)):
+        async with primary_read_session() as session:
+            yield _repository(session)
+    else:
+        async with read_session() as session:
+            yield _read_repository(session)
@@ -0,0 +1,96 @@
+"""Coalescing of duplicate submits (double clicks, frontend retries).
+
+Identical requests that arrive while one is in flight await that execution
+instead of running their own, and requests that arrive shortly after it
+finished replay its result. State is per-process, which is enough for the
+duplicates this targets: they come from one client within milliseconds.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+
+class IdempotencyKeyReused(Exception):
+    """The key is live for a request with a different payload."""
+
+
+class _Entry:
+    __slots__ = ("future", "deadline", "fingerprint")
+
+    def __init__(self, future: asyncio.Future, fingerprint: Hashable) -> None:
+        self.future = future
+        # Kept forever while in flight; set to the replay deadline once it completes
+        self.deadline = math.inf
+        self.fingerprint = fingerprint
+
+
+_entries: dict[Hashable, _Entry] = {}
+
+
+async def coalesce(key: Hashable, fn: Callable[[], Awaitable[T]], fingerprint: Hashable = None) -> T:
+    """Run fn once per key; concurrent and short-window duplicates share its result.
+
+    fingerprint identifies the payload behind the key: a live entry whose
+    fingerprint differs raises IdempotencyKeyReused instead of replaying.
+    """
+    while True:
+        now = time.monotonic()
+        entry = _entries.get(key)
+        if entry is None or entry.deadline < now:
+            break
+        if entry.fingerprint != fingerprint:
+            raise IdempotencyKeyReused(key)
+        try:
+            return await asyncio.shield(entry.future)
+        except asyncio.CancelledError:
+            # The owning request was cancelled (its entry is gone): run it ourselves.
+            # If the future is still pending, it was this request that got cancelled.
+            if not entry.future.cancelled():
+                raise
+
+    entry = _Entry(asyncio.get_running_loop().create_future(), fingerprint)
+    _entries[key] = entry
+    try:
+        result = await fn()
+    except BaseException as exc:
+        # Failures are never replayed: drop the key so the next duplicate retries
+        _entries.pop(key, None)
+        if isinstance(exc, asyncio.CancelledError):
+            entry.future.cancel()
+        else:
+            entry.future.set_exception(exc)
+            entry.future.exception()  # mark retrieved when nobody was waiting
+        raise
+
+    entry.future.set_result(result)
+    entry.deadline = time.monotonic() + settings.duplicate_submit_window_seconds
+    _prune(now)
+    return result
+
+
+def _prune(now: float) -> None:
+    if len(_entries) <= 1024:
+        return
+    for key in [k for k, e in _entries.items() if e.deadline < now]:
+        del _entries[key]
+
+
+def puzzle_check_key(
+    session_id: Any, stage: int, answer: str, include_next: bool, idempotency_key: str | None
+) -> tuple[Hashable, Hashable]:
+    """Key and payload fingerprint of a puzzle check.
+
+    Keyed by the client-supplied Idempotency-Key when present, else by the
+    normalized content itself.
+    """
+    fingerprint = (stage, answer.strip().lower(), include_next)
+    if idempotency_key:
+        return ("key", session_id, idempotency_key), fingerprint
+    return ("check", session_id, *fingerprint), fingerprint
@@ -1,11 +1,31 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, LargeBinary, String, Text, TypeDecorator, Uuid, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
+class TZDateTime(TypeDecorator):
+    """Timezone-aware UTC datetime on every backend.
+
+    Postgres stores timestamptz natively; SQLite has no timezone support, so
+    values are stored as naive UTC and tagged back to UTC on load.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value: datetime | None, dialect) -> datetime | None:
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value
+
+    def process_result_value(self, value: datetime | None, dialect) -> datetime | None:
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -13,11 +33,11 @@ class Base(DeclarativeBase):
 class Session(Base):
     __tablename__ = "sessions"
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     fingerprint: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     current_stage: Mapped[int] = mapped_column(Integer, default=0)
-    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    started_at: Mapped[datetime] = mapped_column(TZDateTime, server_default=func.now())
+    expires_at: Mapped[datetime] = mapped_column(TZDateTime)
     completed: Mapped[bool] = mapped_column(Boolean, default=False)
     challenge_status: Mapped[str] = mapped_column(String(20), default="none")
     trolling_phase: Mapped[str] = mapped_column(String(20), default="error")
@@ -30,10 +50,43 @@ class AttemptLog(Base):
     __tablename__ = "attempt_logs"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("sessions.id"))
+    session_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("sessions.id"))
     stage: Mapped[int] = mapped_column(Integer)
     answer: Mapped[str] = mapped_column(Text)
     correct: Mapped[bool] = mapped_column(Boolean)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(TZDateTime, server_default=func.now())
 
     session: Mapped["Session"] = relationship(back_populates="attempts")
+
+
+# --- Compact attempt storage (settings.compact_attempts) ---
+
+
+class AnswerText(Base):
+    """Dictionary of normalized answers, shared by every session."""
+
+    __tablename__ = "answer_texts"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # sha256 of text: answers are free-form, so index the digest rather than the text
+    digest: Mapped[str] = mapped_column(String(64), unique=True)
+    text: Mapped[str] = mapped_column(Text)
+
+
+class AttemptGroup(Base):
+    """One attempt, or a run of consecutive identical wrong attempts collapsed into a counter."""
+
+    __tablename__ = "attempt_groups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    session_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("sessions.id"), index=True)
+    stage: Mapped[int] = mapped_column(Integer)
+    # Exactly one of answer_id / packed is set: packed holds msgpack of a complex_captcha answer
+    answer_id: Mapped[int | None] = mapped_column(ForeignKey("answer_texts.id"), nullable=True)
+    packed: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    correct: Mapped[bool] = mapped_column(Boolean)
+    count: Mapped[int] = mapped_column(Integer, default=1)
+    first_at: Mapped[datetime] = mapped_column(TZDateTime)
+    last_at: Mapped[datetime] = mapped_column(TZDateTime)
+
+    answer: Mapped["AnswerText | None"] = relationship(lazy="joined")
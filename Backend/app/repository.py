@@ -0,0 +1,214 @@
+"""Storage repositories — the only layer that talks to the database.
+
+The models use dialect-agnostic types, so Postgres and SQLite share the
+query code in SqlRepository; each backend owns its engine setup.
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import event, make_url, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.models import AnswerText, AttemptGroup, AttemptLog, Session
+
+
+class Repository(ABC):
+    """Storage operations used by the service layer."""
+
+    @abstractmethod
+    async def get_session(self, session_id: UUID) -> Session | None: ...
+
+    @abstractmethod
+    async def get_session_by_fingerprint(self, fingerprint: str) -> Session | None: ...
+
+    @abstractmethod
+    async def list_sessions(self) -> Sequence[Session]:
+        """All sessions, newest first."""
+
+    @abstractmethod
+    async def list_attempts(self, session_id: UUID) -> Sequence[AttemptLog]:
+        """Attempts of a session in the order they were made."""
+
+    @abstractmethod
+    async def add_session(self, session: Session) -> Session:
+        """Persist a new session and load its server-side defaults."""
+
+    @abstractmethod
+    def add_attempt(self, attempt: AttemptLog) -> None:
+        """Stage an attempt; it is written on the next commit."""
+
+    @abstractmethod
+    async def add_compact_attempt(
+        self, session_id: UUID, stage: int, answer: str | None, packed: bytes | None, correct: bool
+    ) -> None:
+        """Stage an attempt in compact storage, folding it into the previous group if it repeats a wrong answer."""
+
+    @abstractmethod
+    async def list_attempt_groups(self, session_id: UUID) -> Sequence[AttemptGroup]:
+        """Compact attempt groups of a session in the order they started, answers loaded."""
+
+    @abstractmethod
+    async def commit(self) -> None: ...
+
+
+class SqlRepository(Repository):
+    """SQLAlchemy implementation shared by the SQL backends."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def create_engine(url: str, for_writes: bool = True) -> AsyncEngine:
+        return create_async_engine(url, echo=False, pool_pre_ping=True)
+
+    @staticmethod
+    def needs_read_engine(url: str) -> bool:
+        """Whether reads on this database need their own create_engine(url, for_writes=False)."""
+        return False
+
+    async def get_session(self, session_id: UUID) -> Session | None:
+        return await self.db.get(Session, session_id)
+
+    async def get_session_by_fingerprint(self, fingerprint: str) -> Session | None:
+        result = await self.db.execute(select(Session).where(Session.fingerprint == fingerprint))
+        return result.scalar_one_or_none()
+
+    async def list_sessions(self) -> Sequence[Session]:
+        result = await self.db.execute(select(Session).order_by(Session.started_at.desc()))
+        return result.scalars().all()
+
+    async def list_attempts(self, session_id: UUID) -> Sequence[AttemptLog]:
+        result = await self.db.execute(
+            select(AttemptLog)
+            .where(AttemptLog.session_id == session_id)
+            .order_by(AttemptLog.created_at, AttemptLog.id)
+        )
+        return result.scalars().all()
+
+    async def add_session(self, session: Session) -> Session:
+        self.db.add(session)
+        await self.db.commit()
+        await self.db.refresh(session)
+        return session
+
+    def add_attempt(self, attempt: AttemptLog) -> None:
+        self.db.add(attempt)
+
+    async def add_compact_attempt(
+        self, session_id: UUID, stage: int, answer: str | None, packed: bytes | None, correct: bool
+    ) -> None:
+        answer_id = await self._intern(answer) if answer is not None else None
+        now = datetime.now(timezone.utc)
+
+        result = await self.db.execute(
+            select(AttemptGroup)
+            .where(AttemptGroup.session_id == session_id, AttemptGroup.stage == stage)
+            .order_by(AttemptGroup.id.desc())
+            .limit(1)
+        )
+        last = result.unique().scalar_one_or_none()
+        # Only consecutive repeats collapse, so the timeline keeps its order
+        if (
+            last is not None
+            and not correct
+            and not last.correct
+            and last.answer_id == answer_id
+            and last.packed == packed
+        ):
+            # Increment in SQL so concurrent repeats from other workers aren't lost
+            await self.db.execute(
+                update(AttemptGroup)
+                .where(AttemptGroup.id == last.id)
+                .values(count=AttemptGroup.count + 1, last_at=now)
+            )
+            return
+
+        self.db.add(AttemptGroup(
+            session_id=session_id,
+            stage=stage,
+            answer_id=answer_id,
+            packed=packed,
+            correct=correct,
+            count=1,
+            first_at=now,
+            last_at=now,
+        ))
+
+    async def _intern(self, text: str) -> int:
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        result = await self.db.execute(select(AnswerText.id).where(AnswerText.digest == digest))
+        answer_id = result.scalar_one_or_none()
+        if answer_id is not None:
+            return answer_id
+
+        entry = AnswerText(digest=digest, text=text)
+        try:
+            async with self.db.begin_nested():
+                self.db.add(entry)
+        except IntegrityError:
+            # A concurrent request interned the same answer first
+            result = await self.db.execute(select(AnswerText.id).where(AnswerText.digest == digest))
+            return result.scalar_one()
+        return entry.id
+
+    async def list_attempt_groups(self, session_id: UUID) -> Sequence[AttemptGroup]:
+        result = await self.db.execute(
+            select(AttemptGroup)
+            .where(AttemptGroup.session_id == session_id)
+            .order_by(AttemptGroup.first_at, AttemptGroup.id)
+        )
+        return result.unique().scalars().all()
+
+    async def commit(self) -> None:
+        await self.db.commit()
+
+
+class PostgresRepository(SqlRepository):
+    """Postgres via asyncpg — the default multi-node deployment."""
+
+
+class SqliteRepository(SqlRepository):
+    """Embedded single-node SQLite via aiosqlite, in WAL mode."""
+
+    @staticmethod
+    def needs_read_engine(url: str) -> bool:
+        # The write engine locks on BEGIN, so reads get a plain-BEGIN engine to keep
+        # WAL's concurrent reads. Not for in-memory databases: a second engine
+        # would open its own, empty database.
+        parsed = make_url(url)
+        return parsed.database not in (None, "", ":memory:") and parsed.query.get("mode") != "memory"
+
+    @staticmethod
+    def create_engine(url: str, for_writes: bool = True) -> AsyncEngine:
+        engine = create_async_engine(url, echo=False)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _configure(dbapi_conn, _record):
+            # Take transaction control away from the sqlite3 driver so we can issue our own BEGIN
+            dbapi_conn.isolation_level = None
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute("PRAGMA busy_timeout=5000")
+            cursor.close()
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def _begin(conn):
+            # Write handlers read then write; taking the write lock up front avoids
+            # SQLITE_BUSY on the read-to-write upgrade. WAL readers never need it.
+            conn.exec_driver_sql("BEGIN IMMEDIATE" if for_writes else "BEGIN")
+
+        return engine
+
+
+def repository_class(url: str) -> type[SqlRepository]:
+    """Pick the repository for a database URL."""
+    if url.startswith("sqlite"):
+        return SqliteRepository
+    return PostgresRepository
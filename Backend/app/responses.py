@@ -0,0 +1,19 @@
+"""Fast JSON responses for msgspec Structs."""
+
+from typing import Any
+
+import msgspec
+from fastapi.responses import JSONResponse
+
+_encoder = msgspec.json.Encoder()
+
+
+class StructResponse(JSONResponse):
+    """JSONResponse that encodes msgspec Structs (and plain containers of them) with msgspec.
+
+    Returning a Response instance from a handler skips FastAPI's response
+    validation and jsonable_encoder pass entirely.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return _encoder.encode(content)
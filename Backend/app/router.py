@@ -3,11 +3,13 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_db, get_read_db, mark_session_written
+from app.idempotency import IdempotencyKeyReused, coalesce, puzzle_check_key
 from app.puzzles import PUZZLES
+from app.repository import Repository
+from app.responses import StructResponse
 from app.s3 import generate_presigned_url
 from app.schemas import PuzzleCheck, SessionStart
 from app.service import (
@@ -28,39 +30,59 @@ router = APIRouter(prefix="/api")
 
 
 @router.post("/session/start")
-async def session_start(body: SessionStart, request: Request, db: AsyncSession = Depends(get_db)):
+async def session_start(body: SessionStart, request: Request, db: Repository = Depends(get_db)):
     ip = request.headers.get("x-forwarded-for", "").split(",")[0].strip() or (
         request.client.host if request.client else None
     )
-    return await start_session(db, body.fingerprint, ip_address=ip)
+    status = await start_session(db, body.fingerprint, ip_address=ip)
+    mark_session_written(status.session_id)
+    return StructResponse(status)
 
 
 @router.get("/session/status")
-async def session_status(session_id: UUID, db: AsyncSession = Depends(get_db)):
+async def session_status(session_id: UUID, db: Repository = Depends(get_read_db)):
     status = await get_session_status(db, session_id)
     if status is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    return status
+    return StructResponse(status)
 
 
 @router.get("/puzzle/{stage}")
-async def puzzle_data(stage: int, session_id: UUID, db: AsyncSession = Depends(get_db)):
+async def puzzle_data(stage: int, session_id: UUID, db: Repository = Depends(get_read_db)):
     data = await get_puzzle_data(db, session_id, stage)
     if data is None:
         raise HTTPException(status_code=404, detail="Puzzle not found")
-    return data
+    return StructResponse(data)
 
 
 @router.post("/puzzle/check")
-async def puzzle_check(body: PuzzleCheck, db: AsyncSession = Depends(get_db)):
-    return await check_answer(db, body.session_id, body.stage, body.answer)
+async def puzzle_check(
+    body: PuzzleCheck,
+    idempotency_key: str | None = Header(default=None),
+    db: Repository = Depends(get_db),
+):
+    # Double clicks and retries coalesce onto one check_answer run and replay its result
+    key, fingerprint = puzzle_check_key(
+        body.session_id, body.stage, body.answer, body.include_next, idempotency_key
+    )
+    try:
+        result = await coalesce(
+            key,
+            lambda: check_answer(db, body.session_id, body.stage, body.answer, include_next=body.include_next),
+            fingerprint,
+        )
+    except IdempotencyKeyReused:
+        raise HTTPException(status_code=422, detail="Idempotency-Key reused with a different request")
+    mark_session_written(body.session_id)
+    return StructResponse(result)
 
 
 @router.post("/puzzle/advance")
-async def puzzle_advance(session_id: UUID, stage: int, db: AsyncSession = Depends(get_db)):
+async def puzzle_advance(session_id: UUID, stage: int, db: Repository = Depends(get_db)):
     ok = await advance_stage(db, session_id, stage)
     if not ok:
         raise HTTPException(status_code=404, detail="Session not found")
+    mark_session_written(session_id)
     return {"ok": True}
 
 
@@ -125,10 +147,11 @@ async def captcha_data(stage: int):
 
 
 @router.post("/trolling/phase")
-async def trolling_phase(session_id: UUID, phase: str, db: AsyncSession = Depends(get_db)):
+async def trolling_phase(session_id: UUID, phase: str, db: Repository = Depends(get_db)):
     ok = await save_trolling_phase(db, session_id, phase)
     if not ok:
         raise HTTPException(status_code=404, detail="Session not found")
+    mark_session_written(session_id)
     return {"ok": True}
 
 
@@ -136,13 +159,15 @@ async def trolling_phase(session_id: UUID, phase: str, db: AsyncSession = Depend
 
 
 @router.post("/challenge/submit")
-async def challenge_submit_endpoint(session_id: UUID, db: AsyncSession = Depends(get_db)):
-    return await challenge_submit(db, session_id)
+async def challenge_submit_endpoint(session_id: UUID, db: Repository = Depends(get_db)):
+    result = await challenge_submit(db, session_id)
+    mark_session_written(session_id)
+    return StructResponse(result)
 
 
 @router.get("/challenge/status")
-async def challenge_status_endpoint(session_id: UUID, db: AsyncSession = Depends(get_db)):
-    return await challenge_status(db, session_id)
+async def challenge_status_endpoint(session_id: UUID, db: Repository = Depends(get_read_db)):
+    return StructResponse(await challenge_status(db, session_id))
 
 
 # --- Admin endpoints ---
@@ -160,18 +185,20 @@ async def admin_login(password: str = Depends(_get_admin_password)):
 
 
 @router.get("/admin/sessions")
-async def admin_sessions(password: str = Depends(_get_admin_password), db: AsyncSession = Depends(get_db)):
-    return await get_all_sessions(db)
+async def admin_sessions(password: str = Depends(_get_admin_password), db: Repository = Depends(get_read_db)):
+    return StructResponse(await get_all_sessions(db))
 
 
 @router.get("/admin/session/{session_id}")
-async def admin_session_detail(session_id: UUID, password: str = Depends(_get_admin_password), db: AsyncSession = Depends(get_db)):
+async def admin_session_detail(session_id: UUID, password: str = Depends(_get_admin_password), db: Repository = Depends(get_read_db)):
     detail = await get_session_detail(db, session_id)
     if detail is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    return detail
+    return StructResponse(detail)
 
 
 @router.post("/admin/approve/{session_id}")
-async def admin_approve_endpoint(session_id: UUID, password: str = Depends(_get_admin_password), db: AsyncSession = Depends(get_db)):
-    return await admin_approve(db, session_id)
+async def admin_approve_endpoint(session_id: UUID, password: str = Depends(_get_admin_password), db: Repository = Depends(get_db)):
+    result = await admin_approve(db, session_id)
+    mark_session_written(session_id)
+    return StructResponse(result)
@@ -1,14 +1,20 @@
 from datetime import datetime
 from uuid import UUID
 
+import msgspec
 from pydantic import BaseModel
 
+# Request bodies stay Pydantic models so FastAPI validates them. Response models
+# are msgspec Structs: handlers build them from trusted DB rows and return them
+# through StructResponse, which encodes straight to bytes without the
+# validate + jsonable_encoder round-trip.
+
 
 class SessionStart(BaseModel):
     fingerprint: str
 
 
-class SessionStatus(BaseModel):
+class SessionStatus(msgspec.Struct):
     session_id: UUID
     current_stage: int
     started_at: datetime
@@ -23,15 +29,11 @@ class PuzzleCheck(BaseModel):
     session_id: UUID
     stage: int
     answer: str
+    # Opt-in: inline the next stage's PuzzleData in a correct PuzzleResult
+    include_next: bool = False
 
 
-class PuzzleResult(BaseModel):
-    correct: bool
-    message: str
-    next_stage: int | None = None
-
-
-class PuzzleData(BaseModel):
+class PuzzleData(msgspec.Struct):
     stage: int
     title: str
     description: str
@@ -42,18 +44,28 @@ class PuzzleData(BaseModel):
     complex_data: dict | None = None
 
 
-class ChallengeStatus(BaseModel):
+class PuzzleResult(msgspec.Struct):
+    correct: bool
+    message: str
+    next_stage: int | None = None
+    next_puzzle: PuzzleData | None = None
+
+
+class ChallengeStatus(msgspec.Struct):
     status: str
 
 
-class AdminAttempt(BaseModel):
+class AdminAttempt(msgspec.Struct):
     stage: int
     answer: str
     correct: bool
     created_at: datetime
+    # Compact storage collapses consecutive identical wrong attempts: count > 1 spans created_at..last_at
+    count: int = 1
+    last_at: datetime | None = None
 
 
-class AdminSessionInfo(BaseModel):
+class AdminSessionInfo(msgspec.Struct):
     session_id: UUID
     fingerprint: str
     ip_address: str | None
@@ -63,7 +75,7 @@ class AdminSessionInfo(BaseModel):
     completed: bool
 
 
-class AdminSessionDetail(BaseModel):
+class AdminSessionDetail(msgspec.Struct):
     session_id: UUID
     fingerprint: str
     ip_address: str | None
@@ -5,12 +5,12 @@ import random
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+import msgspec
 
 from app.config import settings
-from app.models import AttemptLog, Session
+from app.models import AttemptGroup, AttemptLog, Session
 from app.puzzles import PUZZLES, TOTAL_STAGES
+from app.repository import Repository
 from app.s3 import generate_presigned_url
 from app.schemas import (
     AdminAttempt,
@@ -23,10 +23,9 @@ from app.schemas import (
 )
 
 
-async def start_session(db: AsyncSession, fingerprint: str, ip_address: str | None = None) -> SessionStatus:
+async def start_session(db: Repository, fingerprint: str, ip_address: str | None = None) -> SessionStatus:
     """Create or restore a session by fingerprint."""
-    result = await db.execute(select(Session).where(Session.fingerprint == fingerprint))
-    session = result.scalar_one_or_none()
+    session = await db.get_session_by_fingerprint(fingerprint)
 
     if session is None:
         now = datetime.now(timezone.utc)
@@ -37,9 +36,7 @@ async def start_session(db: AsyncSession, fingerprint: str, ip_address: str | No
             expires_at=now + timedelta(hours=settings.session_duration_hours),
             ip_address=ip_address,
         )
-        db.add(session)
-        await db.commit()
-        await db.refresh(session)
+        session = await db.add_session(session)
     elif ip_address and not session.ip_address:
         session.ip_address = ip_address
         await db.commit()
@@ -47,14 +44,14 @@ async def start_session(db: AsyncSession, fingerprint: str, ip_address: str | No
     return _session_to_status(session)
 
 
-async def get_session_status(db: AsyncSession, session_id: UUID) -> SessionStatus | None:
-    session = await db.get(Session, session_id)
+async def get_session_status(db: Repository, session_id: UUID) -> SessionStatus | None:
+    session = await db.get_session(session_id)
     if session is None:
         return None
     return _session_to_status(session)
 
 
-async def get_puzzle_data(db: AsyncSession, session_id: UUID, stage: int) -> PuzzleData | None:
+async def get_puzzle_data(db: Repository, session_id: UUID, stage: int) -> PuzzleData | None:
     puzzle = PUZZLES.get(stage)
     if puzzle is None:
         return None
@@ -131,8 +128,11 @@ async def get_puzzle_data(db: AsyncSession, session_id: UUID, stage: int) -> Puz
     return data
 
 
-async def check_answer(db: AsyncSession, session_id: UUID, stage: int, answer: str) -> PuzzleResult:
-    session = await db.get(Session, session_id)
+async def check_answer(
+    db: Repository, session_id: UUID, stage: int, answer: str, include_next: bool = False
+) -> PuzzleResult:
+    """Check an answer; with include_next a correct result carries the next stage's PuzzleData."""
+    session = await db.get_session(session_id)
     if session is None:
         return PuzzleResult(correct=False, message="Сессия не найдена")
 
@@ -197,13 +197,17 @@ async def check_answer(db: AsyncSession, session_id: UUID, stage: int, answer: s
         correct = normalized == expected or normalized in aliases
 
     # Log attempt
-    log = AttemptLog(
-        session_id=session_id,
-        stage=stage,
-        answer=answer,
-        correct=correct,
-    )
-    db.add(log)
+    if settings.compact_attempts:
+        text, packed = _compact_answer(puzzle["type"], answer)
+        await db.add_compact_attempt(session_id, stage, text, packed, correct)
+    else:
+        log = AttemptLog(
+            session_id=session_id,
+            stage=stage,
+            answer=answer,
+            correct=correct,
+        )
+        db.add_attempt(log)
 
     if correct:
         next_stage = stage + 1
@@ -213,6 +217,8 @@ async def check_answer(db: AsyncSession, session_id: UUID, stage: int, answer: s
             correct=True,
             message=puzzle["correct_message"],
             next_stage=next_stage,
+            # Saves the client the advance + puzzle fetch round-trips; None past the last puzzle
+            next_puzzle=await get_puzzle_data(db, session_id, next_stage) if include_next else None,
         )
 
     await db.commit()
@@ -222,9 +228,9 @@ async def check_answer(db: AsyncSession, session_id: UUID, stage: int, answer: s
     return PuzzleResult(correct=False, message=random.choice(messages))
 
 
-async def advance_stage(db: AsyncSession, session_id: UUID, stage: int) -> bool:
+async def advance_stage(db: Repository, session_id: UUID, stage: int) -> bool:
     """Advance session to a specific stage (for non-puzzle screens like trolling)."""
-    session = await db.get(Session, session_id)
+    session = await db.get_session(session_id)
     if session is None:
         return False
     session.current_stage = stage
@@ -235,9 +241,9 @@ async def advance_stage(db: AsyncSession, session_id: UUID, stage: int) -> bool:
     return True
 
 
-async def challenge_submit(db: AsyncSession, session_id: UUID) -> ChallengeStatus:
+async def challenge_submit(db: Repository, session_id: UUID) -> ChallengeStatus:
     """User claims they did pushups — set to pending."""
-    session = await db.get(Session, session_id)
+    session = await db.get_session(session_id)
     if session is None:
         return ChallengeStatus(status="error")
     session.challenge_status = "pending"
@@ -245,17 +251,17 @@ async def challenge_submit(db: AsyncSession, session_id: UUID) -> ChallengeStatu
     return ChallengeStatus(status="pending")
 
 
-async def challenge_status(db: AsyncSession, session_id: UUID) -> ChallengeStatus:
+async def challenge_status(db: Repository, session_id: UUID) -> ChallengeStatus:
     """Poll challenge status."""
-    session = await db.get(Session, session_id)
+    session = await db.get_session(session_id)
     if session is None:
         return ChallengeStatus(status="error")
     return ChallengeStatus(status=session.challenge_status)
 
 
-async def admin_approve(db: AsyncSession, session_id: UUID) -> ChallengeStatus:
+async def admin_approve(db: Repository, session_id: UUID) -> ChallengeStatus:
     """Admin approves the challenge."""
-    session = await db.get(Session, session_id)
+    session = await db.get_session(session_id)
     if session is None:
         return ChallengeStatus(status="error")
     session.challenge_status = "approved"
@@ -263,10 +269,9 @@ async def admin_approve(db: AsyncSession, session_id: UUID) -> ChallengeStatus:
     return ChallengeStatus(status="approved")
 
 
-async def get_all_sessions(db: AsyncSession) -> list[AdminSessionInfo]:
+async def get_all_sessions(db: Repository) -> list[AdminSessionInfo]:
     """Get all sessions for admin dashboard."""
-    result = await db.execute(select(Session).order_by(Session.started_at.desc()))
-    sessions = result.scalars().all()
+    sessions = await db.list_sessions()
     return [
         AdminSessionInfo(
             session_id=s.id,
@@ -281,19 +286,16 @@ async def get_all_sessions(db: AsyncSession) -> list[AdminSessionInfo]:
     ]
 
 
-async def get_session_detail(db: AsyncSession, session_id: UUID) -> AdminSessionDetail | None:
+async def get_session_detail(db: Repository, session_id: UUID) -> AdminSessionDetail | None:
     """Get full session detail with attempts."""
-    session = await db.get(Session, session_id)
+    session = await db.get_session(session_id)
     if session is None:
         return None
 
-    result = await db.execute(
-        select(AttemptLog)
-        .where(AttemptLog.session_id == session_id)
-        .order_by(AttemptLog.created_at)
-    )
-    attempts = result.scalars().all()
+    attempts = await db.list_attempts(session_id)
+    groups = await db.list_attempt_groups(session_id)
 
+    # Sessions may have attempts in both stores if compact_attempts was switched on mid-way
     attempt_list = [
         AdminAttempt(
             stage=a.stage,
@@ -302,9 +304,10 @@ async def get_session_detail(db: AsyncSession, session_id: UUID) -> AdminSession
             created_at=a.created_at,
         )
         for a in attempts
-    ]
-    total_correct = sum(1 for a in attempts if a.correct)
-    total_wrong = sum(1 for a in attempts if not a.correct)
+    ] + [_group_to_attempt(g) for g in groups]
+    attempt_list.sort(key=lambda a: a.created_at)
+    total_correct = sum(a.count for a in attempt_list if a.correct)
+    total_wrong = sum(a.count for a in attempt_list if not a.correct)
 
     return AdminSessionDetail(
         session_id=session.id,
@@ -321,9 +324,9 @@ async def get_session_detail(db: AsyncSession, session_id: UUID) -> AdminSession
     )
 
 
-async def save_trolling_phase(db: AsyncSession, session_id: UUID, phase: str) -> bool:
+async def save_trolling_phase(db: Repository, session_id: UUID, phase: str) -> bool:
     """Save trolling sub-phase to DB for persistence across refreshes."""
-    session = await db.get(Session, session_id)
+    session = await db.get_session(session_id)
     if session is None:
         return False
     session.trolling_phase = phase
@@ -331,6 +334,33 @@ async def save_trolling_phase(db: AsyncSession, session_id: UUID, phase: str) ->
     return True
 
 
+def _compact_answer(ptype: str, answer: str) -> tuple[str | None, bytes | None]:
+    """Split an answer into (normalized text to intern, packed complex_captcha payload)."""
+    if ptype == "complex_captcha":
+        try:
+            return None, msgspec.msgpack.encode(json.loads(answer))
+        except (ValueError, OverflowError, TypeError):
+            # Not JSON, or holds values msgpack can't represent (huge integers,
+            # lone surrogates): keep it as text
+            pass
+    return answer.strip().lower(), None
+
+
+def _group_to_attempt(group: AttemptGroup) -> AdminAttempt:
+    if group.packed is not None:
+        answer = msgspec.json.encode(msgspec.msgpack.decode(group.packed)).decode()
+    else:
+        answer = group.answer.text
+    return AdminAttempt(
+        stage=group.stage,
+        answer=answer,
+        correct=group.correct,
+        created_at=group.first_at,
+        count=group.count,
+        last_at=group.last_at if group.count > 1 else None,
+    )
+
+
 def _session_to_status(session: Session) -> SessionStatus:
     now = datetime.now(timezone.utc)
     return SessionStatus(
@@ -0,0 +1,184 @@
+"""Compare response serialization cost per endpoint: Pydantic + jsonable_encoder vs msgspec.
+
+Run from Backend/:  python -m benchmarks.serialization [iterations]
+"""
+
+import json
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.responses import StructResponse
+from app.schemas import (
+    AdminAttempt,
+    AdminSessionDetail,
+    AdminSessionInfo,
+    PuzzleData,
+    PuzzleResult,
+    SessionStatus,
+)
+
+
+# --- Pydantic equivalents of the response models (the previous code path) ---
+
+
+class LegacySessionStatus(BaseModel):
+    session_id: uuid.UUID
+    current_stage: int
+    started_at: datetime
+    expires_at: datetime
+    completed: bool
+    expired: bool
+    challenge_status: str
+    trolling_phase: str
+
+
+class LegacyPuzzleData(BaseModel):
+    stage: int
+    title: str
+    description: str
+    type: str
+    photo_urls: list[str] = []
+    options: list[str] = []
+    audio_url: str | None = None
+    complex_data: dict | None = None
+
+
+class LegacyPuzzleResult(BaseModel):
+    correct: bool
+    message: str
+    next_stage: int | None = None
+    next_puzzle: LegacyPuzzleData | None = None
+
+
+class LegacyAdminAttempt(BaseModel):
+    stage: int
+    answer: str
+    correct: bool
+    created_at: datetime
+    count: int = 1
+    last_at: datetime | None = None
+
+
+class LegacyAdminSessionInfo(BaseModel):
+    session_id: uuid.UUID
+    fingerprint: str
+    ip_address: str | None
+    current_stage: int
+    challenge_status: str
+    started_at: datetime
+    completed: bool
+
+
+class LegacyAdminSessionDetail(BaseModel):
+    session_id: uuid.UUID
+    fingerprint: str
+    ip_address: str | None
+    current_stage: int
+    challenge_status: str
+    started_at: datetime
+    expires_at: datetime
+    completed: bool
+    attempts: list[LegacyAdminAttempt]
+    total_correct: int
+    total_wrong: int
+
+
+def _sample_payloads() -> dict[str, tuple[dict | list[dict], type, type]]:
+    now = datetime.now(timezone.utc)
+    sid = uuid.uuid4()
+    status = dict(
+        session_id=sid,
+        current_stage=3,
+        started_at=now,
+        expires_at=now + timedelta(hours=4),
+        completed=False,
+        expired=False,
+        challenge_status="none",
+        trolling_phase="error",
+    )
+    result = dict(correct=True, message="О, ты реально Лиза!", next_stage=4)
+    complex_data = {
+        "part_a": {"questions": [
+            {"text": f"Вопрос {i}", "options": [
+                {"label": f"Вариант {j}", "photo_url": f"https://s3.example/p/{i}/{j}.jpg?X-Amz-Signature=abc"}
+                for j in range(4)
+            ]}
+            for i in range(3)
+        ]},
+        "part_b": {"rounds": [
+            {"instruction": "Выбери все фото", "grid_urls": [f"https://s3.example/g/{r}/{k}.jpg" for k in range(9)]}
+            for r in range(3)
+        ]},
+    }
+    puzzle = dict(stage=7, title="Этап 7", description="Капча", type="complex_captcha", complex_data=complex_data)
+    sessions = [
+        dict(
+            session_id=uuid.uuid4(),
+            fingerprint=f"fp-{i}",
+            ip_address="10.0.0.1",
+            current_stage=i % 12,
+            challenge_status="none",
+            started_at=now,
+            completed=False,
+        )
+        for i in range(200)
+    ]
+    attempts = [dict(stage=i % 12, answer=f"answer {i}", correct=i % 3 == 0, created_at=now) for i in range(100)]
+    detail = dict(
+        session_id=sid,
+        fingerprint="fp",
+        ip_address="10.0.0.1",
+        current_stage=5,
+        challenge_status="none",
+        started_at=now,
+        expires_at=now + timedelta(hours=4),
+        completed=False,
+        attempts=attempts,
+        total_correct=34,
+        total_wrong=66,
+    )
+    return {
+        "GET /session/status": (status, LegacySessionStatus, SessionStatus),
+        "POST /puzzle/check": (result, LegacyPuzzleResult, PuzzleResult),
+        "GET /puzzle/{stage}": (puzzle, LegacyPuzzleData, PuzzleData),
+        "GET /admin/sessions": (sessions, LegacyAdminSessionInfo, AdminSessionInfo),
+        "GET /admin/session/{id}": (detail, LegacyAdminSessionDetail, AdminSessionDetail),
+    }
+
+
+def _build_struct(struct_cls: type, data: dict):
+    if struct_cls is AdminSessionDetail:
+        data = {**data, "attempts": [AdminAttempt(**a) for a in data["attempts"]]}
+    return struct_cls(**data)
+
+
+def main(iterations: int = 2000) -> None:
+    print(f"{'endpoint':<26}{'pydantic µs':>14}{'msgspec µs':>14}{'speedup':>10}")
+    for endpoint, (data, legacy_cls, struct_cls) in _sample_payloads().items():
+        if isinstance(data, list):
+            legacy = [legacy_cls(**d) for d in data]
+            fast = [_build_struct(struct_cls, d) for d in data]
+        else:
+            legacy = legacy_cls(**data)
+            fast = _build_struct(struct_cls, data)
+
+        # The public contract must not change: both paths produce the same JSON document.
+        legacy_body = JSONResponse(jsonable_encoder(legacy)).body
+        fast_body = StructResponse(fast).body
+        assert json.loads(legacy_body) == json.loads(fast_body), endpoint
+
+        t_legacy = timeit.timeit(lambda: JSONResponse(jsonable_encoder(legacy)), number=iterations)
+        t_fast = timeit.timeit(lambda: StructResponse(fast), number=iterations)
+        us_legacy = t_legacy / iterations * 1e6
+        us_fast = t_fast / iterations * 1e6
+        print(f"{endpoint:<26}{us_legacy:>14.1f}{us_fast:>14.1f}{us_legacy / us_fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
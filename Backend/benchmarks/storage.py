@@ -0,0 +1,85 @@
+"""Compare per-request latency of the storage backends through the service layer.
+
+Run from Backend/:  python -m benchmarks.storage [requests]
+
+SQLite runs against a temporary file. Postgres runs only when
+BENCH_POSTGRES_URL points at a disposable database (its tables are dropped).
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Base
+from app.repository import repository_class
+from app.service import check_answer, get_session_detail, get_session_status, start_session
+
+
+async def _bench_backend(url: str, requests: int) -> dict[str, list[float]]:
+    repo_cls = repository_class(url)
+    engine = repo_cls.create_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    # Reads go through the read engine, as get_read_db serves them in production
+    if repo_cls.needs_read_engine(url):
+        read_engine = repo_cls.create_engine(url, for_writes=False)
+        read_factory = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    else:
+        read_engine = engine
+        read_factory = factory
+
+    timings: dict[str, list[float]] = {}
+
+    async def timed(name: str, op: Callable, read: bool = False) -> object:
+        # One AsyncSession per call, like one request through get_db / get_read_db
+        async with (read_factory if read else factory)() as db:
+            start = time.perf_counter()
+            result = await op(repo_cls(db))
+            timings.setdefault(name, []).append(time.perf_counter() - start)
+            return result
+
+    for i in range(requests):
+        status = await timed("start_session", lambda r: start_session(r, f"bench-{uuid.uuid4()}"))
+        sid = status.session_id
+        await timed("check_answer (wrong)", lambda r: check_answer(r, sid, 1, f"guess {i}"))
+        await timed("check_answer (correct)", lambda r: check_answer(r, sid, 1, "bambylimon"))
+        await timed("get_session_status", lambda r: get_session_status(r, sid), read=True)
+        await timed("get_session_detail", lambda r: get_session_detail(r, sid), read=True)
+
+    if read_engine is not engine:
+        await read_engine.dispose()
+    await engine.dispose()
+    return timings
+
+
+def _report(backend: str, timings: dict[str, list[float]]) -> None:
+    print(f"\n{backend}")
+    print(f"{'operation':<26}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, samples in timings.items():
+        samples = sorted(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"{name:<26}{statistics.median(samples) * 1e3:>10.2f}{p95 * 1e3:>10.2f}")
+
+
+async def main(requests: int = 200) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        _report("sqlite (WAL)", await _bench_backend(f"sqlite+aiosqlite:///{tmp}/bench.db", requests))
+
+    pg_url = os.environ.get("BENCH_POSTGRES_URL")
+    if pg_url:
+        _report("postgres", await _bench_backend(pg_url, requests))
+    else:
+        print("\npostgres: skipped (set BENCH_POSTGRES_URL)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -398,7 +398,7 @@ export default function AdminPage() {
                               <div className="flex items-center gap-1.5">
                                 <div className="w-3 h-3 rounded-sm bg-purple-500/30 border border-purple-500/50" />
                                 <span className="text-xs font-mono text-purple-400">
-                                  {d.attempts.length} всего
+                                  {d.total_correct + d.total_wrong} всего
                                 </span>
                               </div>
                               {d.total_correct + d.total_wrong > 0 && (
@@ -442,6 +442,9 @@ export default function AdminPage() {
                                       </span>
                                       <span className="text-gray-200 truncate">
                                         {a.answer}
+                                        {a.count > 1 && (
+                                          <span className="text-red-400/70"> ×{a.count}</span>
+                                        )}
                                       </span>
                                       <span>
                                         {a.correct ? (
@@ -85,7 +85,13 @@ export default function PuzzlePage() {
     }
   };
 
-  const onPuzzleComplete = () => {
+  const onPuzzleComplete = (nextPuzzle?: PuzzleData | null) => {
+    // check_answer already moved the session forward; show the inlined stage without extra requests
+    if (nextPuzzle) {
+      setPuzzleData(nextPuzzle);
+      setLocalStage(nextPuzzle.stage);
+      return;
+    }
     const next = currentStage + 1;
     advanceToStage(next > 10 ? 11 : next);
   };
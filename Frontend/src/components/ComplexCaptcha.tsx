@@ -4,7 +4,7 @@ import { useState } from "react";
 import { motion, AnimatePresence } from "framer-motion";
 import { Button } from "@/components/ui/button";
 import { PuzzleStage } from "./PuzzleStage";
-import { api, type ComplexCaptchaData } from "@/lib/api";
+import { api, type ComplexCaptchaData, type PuzzleData } from "@/lib/api";
 import { useSound } from "@/hooks/useSound";
 import { Loader2 } from "lucide-react";
 import confetti from "canvas-confetti";
@@ -15,7 +15,7 @@ interface ComplexCaptchaProps {
   description: string;
   complexData: ComplexCaptchaData;
   sessionId: string;
-  onComplete: () => void;
+  onComplete: (nextPuzzle?: PuzzleData | null) => void;
   onFlash?: (color: "red" | "green") => void;
 }
 
@@ -82,14 +82,14 @@ export function ComplexCaptcha({ stage, title, description, complexData, session
     setLoading(true);
     try {
       const answerJson = JSON.stringify({ part_a: partA, part_b: partB });
-      const result = await api.checkAnswer(sessionId, stage, answerJson);
+      const result = await api.checkAnswer(sessionId, stage, answerJson, true);
       setMessage(result.message);
       if (result.correct) {
         setSolved(true);
         playSound("correct");
         onFlash?.("green");
         confetti({ particleCount: 200, spread: 120, origin: { y: 0.6 } });
-        setTimeout(onComplete, 3500);
+        setTimeout(() => onComplete(result.next_puzzle), 3500);
       } else {
         playSound("wrong");
         onFlash?.("red");
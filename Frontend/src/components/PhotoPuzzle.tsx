@@ -5,7 +5,7 @@ import { motion } from "framer-motion";
 import { Input } from "@/components/ui/input";
 import { Button } from "@/components/ui/button";
 import { PuzzleStage } from "./PuzzleStage";
-import { api } from "@/lib/api";
+import { api, type PuzzleData } from "@/lib/api";
 import { useSound } from "@/hooks/useSound";
 import confetti from "canvas-confetti";
 
@@ -15,7 +15,7 @@ interface PhotoPuzzleProps {
   description: string;
   photoUrls: string[];
   sessionId: string;
-  onComplete: () => void;
+  onComplete: (nextPuzzle?: PuzzleData | null) => void;
   onFlash?: (color: "red" | "green") => void;
 }
 
@@ -32,14 +32,14 @@ export function PhotoPuzzle({ stage, title, description, photoUrls, sessionId, o
     playSound("click");
     setLoading(true);
     try {
-      const result = await api.checkAnswer(sessionId, stage, answer);
+      const result = await api.checkAnswer(sessionId, stage, answer, true);
       setMessage(result.message);
       if (result.correct) {
         setSolved(true);
         playSound("correct");
         onFlash?.("green");
         confetti({ particleCount: 100, spread: 70, origin: { y: 0.6 } });
-        setTimeout(onComplete, 3500);
+        setTimeout(() => onComplete(result.next_puzzle), 3500);
       } else {
         playSound("wrong");
         onFlash?.("red");
@@ -5,7 +5,7 @@ import { motion } from "framer-motion";
 import { Input } from "@/components/ui/input";
 import { Button } from "@/components/ui/button";
 import { PuzzleStage } from "./PuzzleStage";
-import { api } from "@/lib/api";
+import { api, type PuzzleData } from "@/lib/api";
 import { useSound } from "@/hooks/useSound";
 import confetti from "canvas-confetti";
 
@@ -14,7 +14,7 @@ interface TextPuzzleProps {
   title: string;
   description: string;
   sessionId: string;
-  onComplete: () => void;
+  onComplete: (nextPuzzle?: PuzzleData | null) => void;
   onFlash?: (color: "red" | "green") => void;
 }
 
@@ -31,14 +31,14 @@ export function TextPuzzle({ stage, title, description, sessionId, onComplete, o
     playSound("click");
     setLoading(true);
     try {
-      const result = await api.checkAnswer(sessionId, stage, answer);
+      const result = await api.checkAnswer(sessionId, stage, answer, true);
       setMessage(result.message);
       if (result.correct) {
         setSolved(true);
         playSound("correct");
         onFlash?.("green");
         confetti({ particleCount: 100, spread: 70, origin: { y: 0.6 } });
-        setTimeout(onComplete, 3500);
+        setTimeout(() => onComplete(result.next_puzzle), 3500);
       } else {
         playSound("wrong");
         onFlash?.("red");
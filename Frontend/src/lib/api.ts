@@ -58,6 +58,7 @@ export interface PuzzleResult {
   correct: boolean;
   message: string;
   next_stage: number | null;
+  next_puzzle?: PuzzleData | null;
 }
 
 export interface CaptchaQuestion {
@@ -85,6 +86,9 @@ export interface AdminAttempt {
   answer: string;
   correct: boolean;
   created_at: string;
+  // > 1 when consecutive identical wrong attempts were collapsed (compact storage)
+  count: number;
+  last_at: string | null;
 }
 
 export interface AdminSessionDetail extends AdminSessionInfo {
@@ -107,10 +111,11 @@ export const api = {
   getPuzzle: (stage: number, sessionId: string) =>
     request<PuzzleData>(`/puzzle/${stage}?session_id=${sessionId}`),
 
-  checkAnswer: (sessionId: string, stage: number, answer: string) =>
+  // includeNext: a correct result carries the next stage's PuzzleData (one round-trip per transition)
+  checkAnswer: (sessionId: string, stage: number, answer: string, includeNext = false) =>
     request<PuzzleResult>("/puzzle/check", {
       method: "POST",
-      body: JSON.stringify({ session_id: sessionId, stage, answer }),
+      body: JSON.stringify({ session_id: sessionId, stage, answer, include_next: includeNext }),
     }),
 
   advanceStage: (sessionId: string, stage: number) =>